@@ -0,0 +1,82 @@
+"""Ranking-quality / latency trade-off of the BM25 prefilter in rank_jobs.
+
+    python bench/bench_bm25_prefilter.py
+
+Runs the real rank_jobs (offline `local` embedding backend) on a seeded fixture
+pool with graded labels, with the prefilter off and at several factors, and
+reports for the final top_k:
+  - P@k and NDCG@k against the labels (2 = on-profile, 1 = relevant but written
+    without any of the profile's role/skill terms, 0 = unrelated; some unrelated
+    postings do mention a profile skill);
+  - texts embedded (what would be Gemini calls);
+  - wall time of the whole rank_jobs call.
+"""
+import math, os, random, sys, tempfile, time
+
+os.environ.setdefault("GOOGLE_API_KEY", "bench")
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_bm25_")
+os.environ["EMBEDDING_BACKEND"] = "local"
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from ai_job_agent.apps.api.settings import settings  # noqa: E402
+from ai_job_agent.apps.match.embeddings import get_backend  # noqa: E402
+from ai_job_agent.apps.match.rank import rank_jobs  # noqa: E402
+from ai_job_agent.apps.search.hit import Hit  # noqa: E402
+
+PROFILE = {"roles": ["Backend Engineer", "Python Developer"],
+           "skills": ["Python", "FastAPI", "PostgreSQL", "Docker", "AWS"],
+           "locations": ["Bengaluru"], "years_experience": 3}
+ON_PROFILE = (["Backend Engineer", "Python Developer", "Senior Backend Engineer"],
+              ["Python", "FastAPI", "PostgreSQL", "Docker", "AWS", "REST APIs"])
+# relevant postings phrased with none of the profile's terms
+SYNONYM = (["Server-Side Developer", "API Platform Developer", "Software Engineer - Services"],
+           ["Django", "Flask", "Celery", "Redis", "microservices", "Kubernetes", "MySQL"])
+UNRELATED = (["Sales Executive", "Graphic Designer", "Accountant", "HR Generalist", "Civil Site Engineer",
+              "Customer Support Associate", "Content Writer", "Data Entry Operator"],
+             ["Excel", "Tally", "Photoshop", "AutoCAD", "cold calling", "payroll", "SEO", "typing"])
+BOILER = "Bengaluru full time hiring immediate joiners good communication skills"
+
+def fixtures(n, n_on=10, n_syn=15, seed=7):
+    """n postings: n_on on-profile, n_syn relevant-by-synonym, the rest unrelated. Counts are
+    fixed so a perfect top_k=20 needs some postings that share no terms with the profile."""
+    rnd = random.Random(seed)
+    grades = [2] * n_on + [1] * n_syn + [0] * (n - n_on - n_syn)
+    rnd.shuffle(grades)
+    hits = []
+    for i, grade in enumerate(grades):
+        titles, skills = (ON_PROFILE, SYNONYM, UNRELATED)[2 - grade]
+        words = rnd.sample(skills, 3)
+        if grade == 0 and rnd.random() < 0.25:
+            words.append(rnd.choice(["Python", "AWS", "Docker"]))  # e.g. "Python training sales"
+        hits.append(Hit(title=rnd.choice(titles), company="Acme Corp", url=f"https://example.com/{i}",
+                        snippet=f"{BOILER} {' '.join(words)}"))
+    return hits, grades
+
+def ndcg(gains, ideal, k):
+    dcg = sum((2**g - 1) / math.log2(i + 2) for i, g in enumerate(gains[:k]))
+    idcg = sum((2**g - 1) / math.log2(i + 2) for i, g in enumerate(sorted(ideal, reverse=True)[:k]))
+    return dcg / idcg if idcg else 0.0
+
+if __name__ == "__main__":
+    top_k = 20
+    backend = get_backend("local")
+    embed, embedded = backend.embed, [0]
+    def counting_embed(texts):
+        embedded[0] += len(texts)
+        return embed(texts)
+    backend.embed = counting_embed
+    rank_jobs(PROFILE, fixtures(50)[0], top_k)  # warm up
+
+    print(f"{'pool':>6} {'factor':>6} {'P@k':>6} {'NDCG@k':>7} {'embedded':>9} {'rank ms':>8}")
+    for n in (200, 1000, 5000):
+        for factor in (0, 2, 3, 5):
+            hits, labels = fixtures(n)
+            label = {h.url: g for h, g in zip(hits, labels)}
+            settings.rank_prefilter_factor = factor
+            embedded[0] = 0
+            t0 = time.perf_counter()
+            ranked = rank_jobs(PROFILE, hits, top_k)
+            ms = (time.perf_counter() - t0) * 1e3
+            gains = [label[h.url] for h in ranked]
+            p_at_k = sum(g > 0 for g in gains) / top_k
+            print(f"{n:>6} {factor or 'off':>6} {p_at_k:>6.2f} {ndcg(gains, labels, top_k):>7.3f} "
+                  f"{embedded[0]:>9} {ms:>8.1f}")
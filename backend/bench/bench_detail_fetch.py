@@ -0,0 +1,69 @@
+"""Throughput of the job-detail fetcher against saved HTML fixtures.
+
+    python bench/bench_detail_fetch.py [n_pages]
+
+1. parse: pages/s for parse_job_page over bench/fixtures/job_pages/*.html.
+2. fetch: serves the fixtures from a local HTTP server (with ETag support) under
+   n distinct URLs on one host and fills n hits with DetailFetcher, cold (200s)
+   and warm (conditional GETs answered with 304). Politeness spacing is disabled
+   so the numbers show fetch + parse + cache cost, not the sleep.
+"""
+import glob, hashlib, os, sys, tempfile, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("GOOGLE_API_KEY", "bench")
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_details_")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from ai_job_agent.apps.search.details import (  # noqa: E402
+    DetailCache, DetailFetcher, HostGate, parse_job_page,
+)
+from ai_job_agent.apps.search.hit import Hit  # noqa: E402
+
+FIXTURES = {os.path.basename(p): open(p, encoding="utf-8").read()
+            for p in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "fixtures", "job_pages", "*.html")))}
+NAMES = list(FIXTURES)
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = FIXTURES[NAMES[int(self.path.rsplit("/", 1)[-1]) % len(NAMES)]].encode("utf-8")
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304); self.send_header("ETag", etag); self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+    def log_message(self, *a):
+        pass
+
+def bench_parse(n):
+    t0 = time.perf_counter()
+    for i in range(n):
+        name = NAMES[i % len(NAMES)]
+        parse_job_page(FIXTURES[name], name.split("_")[0])
+    dt = time.perf_counter() - t0
+    print(f"parse       {n:5d} pages  {n/dt:8.0f} pages/s")
+
+def bench_fetch(n):
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_port}/job/"
+    fetcher = DetailFetcher(DetailCache(os.path.join(os.environ["DATA_DIR"], "pages.sqlite3")),
+                            HostGate(concurrency=8, interval=0.0), workers=8, fresh_seconds=0)
+    for label in ("fetch cold", "fetch warm"):
+        hits = [Hit(title=f"job {i}", url=f"{base}{i}", portal=NAMES[i % len(NAMES)].split("_")[0])
+                for i in range(n)]
+        t0 = time.perf_counter()
+        fetcher.fill(hits, limit=n)
+        dt = time.perf_counter() - t0
+        filled = sum(1 for h in hits if h.company)
+        print(f"{label:11s} {n:5d} pages  {n/dt:8.0f} pages/s  filled={filled}")
+    srv.shutdown()
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    bench_parse(n)
+    bench_fetch(n)
@@ -0,0 +1,51 @@
+"""Memory/allocation benchmark: dict-per-stage hits vs slotted ``Hit``.
+
+    python bench/bench_hit_memory.py [n_hits]
+
+Simulates the search -> rank path on an n-hit batch (default 100k): the old
+path builds a dict per hit in the searcher and copies it again when scoring;
+the new path allocates one ``Hit`` and scores it in place.
+"""
+import os, sys, tracemalloc, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from ai_job_agent.apps.search.hit import Hit  # noqa: E402
+
+def _rows(n):
+    return [{"title": f"Backend Engineer {i}", "url": f"https://example.com/jobs/{i}",
+             "snippet": f"Python FastAPI role number {i}"} for i in range(n)]
+
+def dict_path(rows):
+    hits = [{"title": r.get("title",""), "company": "", "location": None, "url": r.get("url"),
+             "portal": "linkedin", "snippet": r.get("snippet","")} for r in rows]
+    ranked = []
+    for i, h in enumerate(hits):
+        h2 = h.copy()
+        h2["score"] = float(i % 100) / 100
+        ranked.append(h2)
+    return hits, ranked
+
+def hit_path(rows):
+    hits = [Hit(title=r.get("title") or "", url=r.get("url"), portal="linkedin",
+                snippet=r.get("snippet") or "") for r in rows]
+    for i, h in enumerate(hits):
+        h.score = float(i % 100) / 100
+    return hits
+
+def measure(fn, rows):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    keep = fn(rows)
+    dt = time.perf_counter() - t0
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return current, peak, dt
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = _rows(n)
+    for name, fn in (("dict+copy", dict_path), ("slotted Hit", hit_path)):
+        cur, peak, dt = measure(fn, rows)
+        print(f"{name:12s} n={n}  retained={cur/2**20:7.1f} MiB  peak={peak/2**20:7.1f} MiB  "
+              f"{cur/n:6.0f} B/hit  {dt*1e3:7.1f} ms")
@@ -0,0 +1,58 @@
+"""CPU per request of the search response path: pydantic vs. FAST_RESPONSES.
+
+    python bench/bench_response_path.py [n_requests]
+
+Mounts two endpoints that return the same precomputed ranked hits and calls them
+in-process through FastAPI's TestClient:
+  - current: the API's _to_job_hit (JobHit.model_construct) per hit -> SearchResponse -> response_model validation ->
+    jsonable serialization -> stdlib json;
+  - fast: Hit dataclasses -> orjson (FastJSONResponse).
+Reports process CPU time per request for 50 hits (the UI maximum) and 1000 hits
+(batch-sized payloads).
+"""
+import os, sys, tempfile, time
+
+os.environ.setdefault("GOOGLE_API_KEY", "bench")
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_response_")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from ai_job_agent.apps.api.responses import hits_response  # noqa: E402
+from ai_job_agent.apps.api.main import _to_job_hit  # noqa: E402
+from ai_job_agent.apps.api.schemas import SearchResponse  # noqa: E402
+from ai_job_agent.apps.search.hit import Hit  # noqa: E402
+
+def make_hits(n):
+    return [Hit(title=f"Backend Engineer {i}", company="Acme Analytics", location="Bengaluru, Karnataka, IN",
+                url=f"https://www.linkedin.com/jobs/view/{1000000 + i}", portal="linkedin",
+                snippet="Build FastAPI services on AWS. Python, PostgreSQL, Docker. " * 3,
+                score=round(1 - i / (n + 1), 3)) for i in range(n)]
+
+def build_app(hits):
+    app = FastAPI()
+
+    @app.post("/current", response_model=SearchResponse)
+    def current():
+        return SearchResponse(hits=[_to_job_hit(h) for h in hits])
+
+    @app.post("/fast", response_model=SearchResponse)
+    def fast():
+        return hits_response(hits)
+
+    return app
+
+def cpu_per_request(client, path, n):
+    client.post(path)  # warm up
+    t0 = time.process_time()
+    for _ in range(n):
+        r = client.post(path)
+    return (time.process_time() - t0) / n, len(r.content)
+
+if __name__ == "__main__":
+    n_req = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for n_hits in (50, 1000):
+        client = TestClient(build_app(make_hits(n_hits)))
+        base, _ = cpu_per_request(client, "/current", n_req)
+        fast, size = cpu_per_request(client, "/fast", n_req)
+        print(f"{n_hits:5d} hits  current {base*1e3:7.3f} ms/req   fast {fast*1e3:7.3f} ms/req   "
+              f"x{base/fast:4.1f}   body {size/1024:.0f} KiB")
@@ -1,25 +1,47 @@
 # src/ai_job_agent/apps/api/main.py
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager
+from typing import List, Optional
 import os, tempfile, shutil
 
 from ai_job_agent.apps.api.settings import settings
+from ai_job_agent.apps.api.responses import FastJSONResponse, hits_response
 from ai_job_agent.apps.api.schemas import (
     HealthResponse, UploadResponse, ProfileIn, ProfileOut,
     SearchRequest, SearchResponse, PipelineRequest,
-    ComposeRequest, ComposeResponse, JobHit, ContactInfo, EnrichRequest
+    ComposeRequest, ComposeResponse, JobHit, ContactInfo, EnrichRequest,
+    SavedSearchIn, SavedSearchOut, FeedEntry
 )
 from ai_job_agent.apps.profile.resume import extract_text_from_pdf, guess_skills, token_count
 from ai_job_agent.apps.profile.profile_store import upsert_profile, get_profile
-from ai_job_agent.apps.search.portals import PortalSearcher, DOMAIN_MAP
-from ai_job_agent.apps.match.rank import rank_jobs
+from ai_job_agent.apps.search.portals import PORTAL_SEARCHERS, build_query, search_portals
+from ai_job_agent.apps.search.details import detail_fetcher
+from ai_job_agent.apps.search.portal_stats import portal_stats
+from ai_job_agent.apps.search.hit import Hit
+from ai_job_agent.apps.match.rank import rank_jobs, lexical_order
 from ai_job_agent.apps.contacts.rocketreach import lookup_hr
 from ai_job_agent.apps.graph.pipeline import run_email_pipeline  # LangGraph-powered compose
+from ai_job_agent.apps.budget.scheduler import budget
+from ai_job_agent.apps.llm.hedge import latency as llm_latency, LLMDeadlineExceeded
+from ai_job_agent.apps.watch import saved_search as watch
+from ai_job_agent.apps.bulk.transfer import jsonl_chunks, iter_hit_rows, import_profiles
+from ai_job_agent.apps.profile.profile_store import iter_profiles
 
-# Construct all portal searchers once
-PORTAL_SEARCHERS = {name: PortalSearcher(name) for name in DOMAIN_MAP.keys()}
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.watch_enabled:
+        watch.scheduler.start()
+    yield
+    watch.scheduler.stop()
 
-app = FastAPI(title="AI Job Agent API")
+app = FastAPI(title="AI Job Agent API", lifespan=lifespan)
+
+def _to_job_hit(h: Hit) -> JobHit:
+    # Internal hits are already clean; skip re-validation at the boundary
+    return JobHit.model_construct(**h.as_dict())
 
 # CORS
 app.add_middleware(
@@ -31,6 +53,8 @@ app.add_middleware(
     ],
     allow_credentials=True, allow_methods=["*"], allow_headers=["*"],
 )
+if settings.fast_responses and settings.gzip_min_bytes > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_min_bytes)
 
 # ---------------------- Misc ----------------------
 
@@ -42,6 +66,21 @@ def root():
 def health():
     return HealthResponse(status="ok", data_dir=settings.data_dir)
 
+@app.get("/budget/stats")
+def budget_stats():
+    """Current upstream token buckets plus queue-wait metrics, per priority."""
+    return budget.stats()
+
+@app.get("/llm/latency")
+def llm_latency_stats():
+    """Per-model latency quantiles and hedge/fallback counters."""
+    return llm_latency.stats()
+
+@app.get("/portals/stats")
+def portals_stats():
+    """Per-portal latency, yield, duplicate rate and SerpAPI calls per top-k hit."""
+    return portal_stats.report()
+
 # ---------------------- Profile ----------------------
 
 @app.post("/profile/set", response_model=ProfileOut)
@@ -82,36 +121,78 @@ def search_jobs(req: SearchRequest, profile_id: str):
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    roles   = profile.get("roles") or []
-    locs    = profile.get("locations") or []
-    portals = profile.get("portals") or list(PORTAL_SEARCHERS.keys())
-    skills  = " ".join(profile.get("skills") or [])
-    base_q  = f"{' OR '.join(roles)} {skills} {' OR '.join(locs)}".strip()
-
-    all_hits = []
-    for portal in portals:
-        s = PORTAL_SEARCHERS.get(portal)
-        if not s:
-            continue
-        hits = s.search(base_q, max_results=max(1, req.max_results // max(1, len(portals))))
-        for h in hits:
-            h["portal"] = portal
-        all_hits.extend(hits)
+    portals  = profile.get("portals") or list(PORTAL_SEARCHERS.keys())
+    all_hits = search_portals(build_query(profile), portals, req.max_results)
+    detail_fetcher.fill(lexical_order(profile, all_hits), settings.detail_fetch_limit, settings.detail_fetch_deadline_s)
 
     ranked = rank_jobs(profile, all_hits, top_k=req.max_results)
-    out = [
-        JobHit(**{
-            "title":   h.get("title", ""),
-            "company": h.get("company", "") or "",
-            "location": h.get("location"),
-            "url":     h.get("url"),
-            "portal":  h.get("portal"),
-            "snippet": h.get("snippet"),
-            "score":   float(h.get("score", 0.0)),
-        })
-        for h in ranked
-    ]
-    return SearchResponse(hits=out)
+    portal_stats.record_survivors(ranked, all_hits)
+    if settings.fast_responses:
+        return hits_response(ranked)
+    return SearchResponse(hits=[_to_job_hit(h) for h in ranked])
+
+# ---------------------- Saved Searches ----------------------
+
+def _saved_search_out(s: dict) -> SavedSearchOut:
+    return SavedSearchOut(**{k: v for k, v in s.items() if k != "seen"}, seen_count=len(s.get("seen") or {}))
+
+@app.post("/saved_searches", response_model=SavedSearchOut)
+def create_saved_search(req: SavedSearchIn):
+    if not get_profile(req.profile_id):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return _saved_search_out(watch.create_saved_search(req.model_dump()))
+
+@app.get("/saved_searches", response_model=List[SavedSearchOut])
+def list_saved_searches(profile_id: Optional[str] = None):
+    return [_saved_search_out(s) for s in watch.list_saved_searches(profile_id)]
+
+@app.delete("/saved_searches/{sid}")
+def delete_saved_search(sid: str):
+    if not watch.delete_saved_search(sid):
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return {"ok": True}
+
+@app.post("/saved_searches/{sid}/run", response_model=SavedSearchOut, status_code=202)
+def run_saved_search(sid: str, background: BackgroundTasks):
+    """Queues a run now (it can take minutes with drafts); read the result from /feed."""
+    s = watch.queue_run(sid)
+    if s is None:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    if watch.scheduler.running:
+        watch.scheduler.wake()
+    else:
+        background.add_task(watch.run_saved_search, sid)
+    return _saved_search_out(s)
+
+@app.get("/saved_searches/{sid}/feed", response_model=List[FeedEntry])
+def saved_search_feed(sid: str, since: float = 0.0):
+    if not watch.get_saved_search(sid):
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    entries = watch.read_feed(sid, since)
+    if settings.fast_responses:
+        return FastJSONResponse(entries)
+    return entries
+
+# ---------------------- Bulk Export / Import ----------------------
+
+@app.get("/bulk/profiles.jsonl")
+def bulk_export_profiles(chunk_size: int = Query(1000, ge=1)):
+    return StreamingResponse(jsonl_chunks(iter_profiles(), chunk_size), media_type="application/x-ndjson")
+
+@app.get("/bulk/hits.jsonl")
+def bulk_export_hits(chunk_size: int = Query(1000, ge=1)):
+    """Ranked hits from all saved-search feeds, one per line. Hit vectors are only
+    exported by the bulk CLI (hit_vectors.npy)."""
+    return StreamingResponse(jsonl_chunks(iter_hit_rows(), chunk_size), media_type="application/x-ndjson")
+
+@app.post("/bulk/profiles")
+def bulk_import_profiles(file: UploadFile = File(...)):
+    """Bulk-loads a JSONL file of profiles in one store write (all or nothing)."""
+    try:
+        n = import_profiles(file.file)
+    except ValueError as e:  # bad JSON or a row failing ProfileIn validation
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"imported": n}
 
 # ---------------------- Contact Enrichment ----------------------
 
@@ -181,7 +262,10 @@ def compose(req: ComposeRequest):
     job_dict = req.job.model_dump()
     contact_dict = req.contact.model_dump() if req.contact else None
 
-    subject, body = run_email_pipeline(profile, job_dict, contact_dict)
+    try:
+        subject, body = run_email_pipeline(profile, job_dict, contact_dict)
+    except LLMDeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
     return ComposeResponse(subject=subject, body=body)
 
 # ---------------------- Simple Orchestrated Pipeline ----------------------
@@ -192,18 +276,11 @@ def pipeline(req: PipelineRequest):
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    roles = profile.get("roles") or []
-    skills = " ".join(profile.get("skills") or [])
-    locs = profile.get("locations") or []
-    q = f"{' OR '.join(roles)} {skills} {' OR '.join(locs)}".strip()
-
-    all_hits = []
-    for p in req.portals:
-        s = PORTAL_SEARCHERS.get(p)
-        if not s:
-            continue
-        all_hits.extend(s.search(q, max_results=max(1, req.max_results // max(1, len(req.portals)))))
+    all_hits = search_portals(build_query(profile), req.portals, req.max_results)
+    detail_fetcher.fill(lexical_order(profile, all_hits), settings.detail_fetch_limit, settings.detail_fetch_deadline_s)
 
     ranked = rank_jobs(profile, all_hits, top_k=req.max_results)
-    out = [JobHit(**{**h, "score": float(h.get("score", 0.0))}) for h in ranked]
-    return SearchResponse(hits=out)
+    portal_stats.record_survivors(ranked, all_hits)
+    if settings.fast_responses:
+        return hits_response(ranked)
+    return SearchResponse(hits=[_to_job_hit(h) for h in ranked])
@@ -0,0 +1,23 @@
+# src/ai_job_agent/apps/api/responses.py
+"""
+Lean response path for large payloads (opt-in via FAST_RESPONSES).
+
+Internal hits are already clean, so these responses skip building and
+re-validating pydantic models and serialize straight from `Hit` dataclasses
+(and plain dicts) with orjson.
+"""
+from typing import Any, List
+import orjson
+from fastapi.responses import Response
+from ai_job_agent.apps.search.hit import Hit
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # orjson handles dataclasses (slotted included) and numpy scalars natively
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def hits_response(hits: List[Hit]) -> FastJSONResponse:
+    """Same JSON shape as SearchResponse."""
+    return FastJSONResponse({"hits": hits})
@@ -81,3 +81,30 @@ class PipelineRequest(BaseModel):
     profile_id: str
     portals: List[str]
     max_results: int = 20
+
+# ---------- Saved searches ----------
+
+class SavedSearchIn(BaseModel):
+    profile_id: str
+    portals: List[str] = []             # empty -> profile's portals
+    max_results: int = 20
+    interval_minutes: int = 24 * 60
+    enrich: bool = True                 # look up a contact for each new posting
+    draft: bool = True                  # draft an outreach email for each new posting
+
+class SavedSearchOut(SavedSearchIn):
+    id: str
+    last_run_at: Optional[float] = None
+    next_run_at: Optional[float] = None
+    seen_count: int = 0
+
+class FeedItem(BaseModel):
+    hit: JobHit
+    contact: Optional[ContactInfo] = None
+    subject: Optional[str] = None
+    body: Optional[str] = None
+
+class FeedEntry(BaseModel):
+    run_at: float
+    fetched: int
+    new: List[FeedItem]
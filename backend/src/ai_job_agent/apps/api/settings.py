@@ -15,6 +15,15 @@ class Settings(BaseSettings):
         validation_alias=env_alias("GEMINI_EMBEDDINGS_MODEL","gemini_embeddings_model"),
     )
 
+    llm_model: str = Field(default="gemini-1.5-flash", validation_alias=env_alias("LLM_MODEL","llm_model"))
+    llm_fallback_model: str = Field(
+        default="gemini-1.5-flash-8b", validation_alias=env_alias("LLM_FALLBACK_MODEL","llm_fallback_model")
+    )
+    llm_deadline_s: float = 40.0        # stays under the frontend's 45 s request timeout
+    llm_hedge_default_s: float = 10.0   # hedge delay until enough latency samples exist
+    llm_hedge_min_s: float = 1.0
+    llm_fallback_margin_s: float = 12.0 # fire the fallback model this long before the deadline
+
     # External APIs (optional)
     serpapi_key: Optional[str] = Field(
         default=None, validation_alias=env_alias("SERPAPI_KEY","serpapi_key")
@@ -23,6 +32,54 @@ class Settings(BaseSettings):
         default=None, validation_alias=env_alias("ROCKETREACH_API_KEY","rocketreach_api_key")
     )
 
+    # Upstream budgets (requests per minute, shared by all workers on the host)
+    serpapi_rpm: float = Field(default=30, validation_alias=env_alias("SERPAPI_RPM","serpapi_rpm"))
+    gemini_embed_rpm: float = Field(
+        default=1500, validation_alias=env_alias("GEMINI_EMBED_RPM","gemini_embed_rpm")
+    )
+    rocketreach_rpm: float = Field(
+        default=10, validation_alias=env_alias("ROCKETREACH_RPM","rocketreach_rpm")
+    )
+    budget_burst_seconds: float = 10.0      # bucket capacity = this many seconds of quota
+    budget_batch_reserve: float = 0.25      # fraction of each bucket batch jobs may not touch
+    budget_max_wait_s: float = 5.0          # interactive requests degrade after this wait
+    budget_batch_max_wait_s: float = 120.0
+
+    # Per-portal allocation
+    portal_overfetch: float = 1.5       # results fetched per search = max_results * this
+    portal_min_results: int = 3         # portals allocated fewer results than this are skipped
+    portal_explore_calls: int = 5       # portals with fewer calls always get a share
+    portal_explore_rate: float = 0.1    # chance a portal under the minimum is probed anyway
+    portal_stats_half_life_s: float = 7 * 86400   # call/yield counts decay with this half-life
+    portal_timeout_min_s: float = 3.0   # per-portal timeout = latency mean + 3 sd, clamped
+    portal_timeout_max_s: float = 25.0
+
+    # Job-page detail fetcher (company/location)
+    detail_fetch_limit: int = 30        # pages fetched per search (0 = off)
+    detail_fetch_workers: int = 8
+    detail_fetch_deadline_s: float = 8.0
+    detail_per_host: int = 2            # concurrent requests per host
+    detail_host_interval_s: float = 0.5 # min spacing between requests to one host
+    detail_cache_fresh_s: float = 3600  # serve cached pages without revalidating
+    detail_cache_max_age_s: float = 7 * 86400
+
+    # Ranking
+    embedding_backend: str = Field(   # gemini | local | hybrid (local first pass, Gemini re-scores)
+        default="gemini", validation_alias=env_alias("EMBEDDING_BACKEND","embedding_backend")
+    )
+    local_embedding_dim: int = 256
+    embedding_rescore_k: int = 0        # hybrid: Gemini re-scores max(top_k, this) candidates
+    rank_prefilter_factor: int = 3      # BM25 keeps factor * top_k hits for embedding (0 = off)
+    rank_lexical_weight: float = 0.15   # share of the final score taken by BM25
+
+    # Saved-search watcher
+    watch_enabled: bool = True
+    watch_poll_seconds: float = 60.0
+
+    # Response path
+    fast_responses: bool = Field(default=False, validation_alias=env_alias("FAST_RESPONSES","fast_responses"))
+    gzip_min_bytes: int = 4096          # with FAST_RESPONSES, gzip responses at least this big (0 = off)
+
     # Storage
     data_dir: str = Field(default="./.data", validation_alias=env_alias("DATA_DIR","data_dir"))
 
@@ -32,6 +89,8 @@ class Settings(BaseSettings):
     def _validate(self):
         if not self.google_api_key:
             raise ValueError("GOOGLE_API_KEY is required")
+        if self.embedding_backend not in ("gemini", "local", "hybrid"):
+            raise ValueError("EMBEDDING_BACKEND must be one of: gemini, local, hybrid")
         return self
 
 settings = Settings()
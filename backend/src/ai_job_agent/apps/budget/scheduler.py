@@ -0,0 +1,167 @@
+# src/ai_job_agent/apps/budget/scheduler.py
+"""
+Token-bucket budgets for upstream APIs (SerpAPI, Gemini embeddings, RocketReach).
+
+Buckets live in a small SQLite file under DATA_DIR so every uvicorn worker on the
+host draws from the same quota. Interactive callers may drain a bucket to zero;
+batch callers (see `priority("batch")`) leave a reserve for interactive traffic.
+"""
+from __future__ import annotations
+import os, sqlite3, threading, time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+from ai_job_agent.apps.api.settings import settings
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+_priority: ContextVar[str] = ContextVar("budget_priority", default=INTERACTIVE)
+
+class BudgetExhausted(Exception):
+    """Raised when an upstream budget could not be acquired within the allowed wait."""
+    def __init__(self, name: str):
+        super().__init__(f"upstream budget exhausted: {name}")
+        self.name = name
+
+@contextmanager
+def priority(level: str):
+    """Run the enclosed calls at the given priority (INTERACTIVE or BATCH)."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS wait_metrics (
+    name TEXT NOT NULL, priority TEXT NOT NULL,
+    acquired INTEGER NOT NULL DEFAULT 0, exhausted INTEGER NOT NULL DEFAULT 0,
+    wait_total REAL NOT NULL DEFAULT 0, wait_max REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, priority)
+);
+"""
+
+class BudgetScheduler:
+    def __init__(self, path: str, per_minute: Dict[str, float], burst_seconds: float = 10.0,
+                 batch_reserve: float = 0.25):
+        self.path = path
+        self.rates = {k: v / 60.0 for k, v in per_minute.items()}
+        self.capacity = {k: max(1.0, r * burst_seconds) for k, r in self.rates.items()}
+        self.batch_reserve = batch_reserve
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _refill(self, c: sqlite3.Connection, name: str, now: float) -> float:
+        row = c.execute("SELECT tokens, updated FROM buckets WHERE name=?", (name,)).fetchone()
+        cap = self.capacity[name]
+        if row is None:
+            return cap
+        tokens, updated = row
+        return min(cap, tokens + max(0.0, now - updated) * self.rates[name])
+
+    def _try_take(self, name: str, cost: float, floor: float) -> float:
+        """Takes `cost` tokens if at least `floor` would remain. Returns 0 on success,
+        otherwise the seconds until enough tokens should be available."""
+        c = self._conn()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            tokens = self._refill(c, name, now)
+            ok = tokens - cost >= floor
+            if ok:
+                tokens -= cost
+            c.execute("INSERT OR REPLACE INTO buckets(name, tokens, updated) VALUES (?,?,?)",
+                      (name, tokens, now))
+            c.execute("COMMIT")
+        except Exception:
+            c.execute("ROLLBACK")
+            raise
+        return 0.0 if ok else (cost + floor - tokens) / self.rates[name]
+
+    def _record(self, name: str, level: str, waited: float, exhausted: bool):
+        self._conn().execute(
+            """INSERT INTO wait_metrics(name, priority, acquired, exhausted, wait_total, wait_max)
+               VALUES (?,?,?,?,?,?)
+               ON CONFLICT(name, priority) DO UPDATE SET
+                 acquired = acquired + excluded.acquired,
+                 exhausted = exhausted + excluded.exhausted,
+                 wait_total = wait_total + excluded.wait_total,
+                 wait_max = MAX(wait_max, excluded.wait_max)""",
+            (name, level, 0 if exhausted else 1, 1 if exhausted else 0,
+             0.0 if exhausted else waited, 0.0 if exhausted else waited),
+        )
+
+    def acquire(self, name: str, cost: float = 1.0, max_wait: Optional[float] = None):
+        """Blocks until `cost` tokens are available for `name`, or raises BudgetExhausted."""
+        if name not in self.rates:
+            return
+        level = _priority.get()
+        if max_wait is None:
+            max_wait = settings.budget_batch_max_wait_s if level == BATCH else settings.budget_max_wait_s
+        cap = self.capacity[name]
+        cost = min(cost, cap)
+        # small buckets can't hold cost + a full reserve; keep what fits so batch can still run
+        floor = min(cap * self.batch_reserve, cap - cost) if level == BATCH else 0.0
+        start = time.monotonic()
+        while True:
+            wait = self._try_take(name, cost, floor)
+            waited = time.monotonic() - start
+            if wait <= 0:
+                self._record(name, level, waited, exhausted=False)
+                return
+            if waited + wait > max_wait:
+                self._record(name, level, waited, exhausted=True)
+                raise BudgetExhausted(name)
+            time.sleep(min(wait, 1.0))
+
+    def drain(self, name: str):
+        """Empties a bucket, e.g. after an upstream 429, so all workers back off together."""
+        if name not in self.rates:
+            return
+        self._conn().execute("INSERT OR REPLACE INTO buckets(name, tokens, updated) VALUES (?,?,?)",
+                             (name, 0.0, time.time()))
+
+    def stats(self) -> Dict[str, Any]:
+        c = self._conn()
+        now = time.time()
+        out: Dict[str, Any] = {}
+        for name in self.rates:
+            out[name] = {
+                "tokens": round(self._refill(c, name, now), 2),
+                "capacity": self.capacity[name],
+                "per_minute": self.rates[name] * 60.0,
+                "waits": {},
+            }
+        for name, level, acquired, exhausted, total, mx in c.execute(
+                "SELECT name, priority, acquired, exhausted, wait_total, wait_max FROM wait_metrics"):
+            if name in out:
+                out[name]["waits"][level] = {
+                    "acquired": acquired, "exhausted": exhausted,
+                    "avg_wait_s": round(total / acquired, 4) if acquired else 0.0,
+                    "max_wait_s": round(mx, 4),
+                }
+        return out
+
+os.makedirs(settings.data_dir, exist_ok=True)
+budget = BudgetScheduler(
+    os.path.join(settings.data_dir, "budget.sqlite3"),
+    per_minute={
+        "serpapi": settings.serpapi_rpm,
+        "gemini_embed": settings.gemini_embed_rpm,
+        "rocketreach": settings.rocketreach_rpm,
+    },
+    burst_seconds=settings.budget_burst_seconds,
+    batch_reserve=settings.budget_batch_reserve,
+)
@@ -0,0 +1,41 @@
+# src/ai_job_agent/apps/bulk/cli.py
+"""
+    python -m ai_job_agent.apps.bulk.cli export --out ./export [--vectors local|gemini|none]
+    python -m ai_job_agent.apps.bulk.cli import ./export/profiles.jsonl
+"""
+import argparse, json
+from ai_job_agent.apps.api.settings import settings
+from ai_job_agent.apps.bulk.transfer import export_dir, import_profiles
+from ai_job_agent.apps.match.embeddings import LocalHashingBackend, get_backend
+
+def _positive_int(v: str) -> int:
+    n = int(v)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {n}")
+    return n
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="ai_job_agent.apps.bulk.cli")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ex = sub.add_parser("export", help="export profiles, ranked hits and hit vectors")
+    ex.add_argument("--out", required=True)
+    ex.add_argument("--chunk-size", type=_positive_int, default=1000)
+    ex.add_argument("--vectors", choices=["local", "gemini", "none"], default="local")
+    im = sub.add_parser("import", help="bulk-load profiles from a JSONL file")
+    im.add_argument("path")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "export":
+        backend = None
+        if args.vectors == "local":
+            # no IDF so vectors don't depend on which chunk a hit landed in
+            backend = LocalHashingBackend(dim=settings.local_embedding_dim, use_idf=False)
+        elif args.vectors == "gemini":
+            backend = get_backend("gemini")
+        print(json.dumps(export_dir(args.out, args.chunk_size, backend)))
+    else:
+        with open(args.path, "rb") as f:
+            print(json.dumps({"imported": import_profiles(f)}))
+
+if __name__ == "__main__":
+    main()
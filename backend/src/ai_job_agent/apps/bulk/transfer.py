@@ -0,0 +1,99 @@
+# src/ai_job_agent/apps/bulk/transfer.py
+"""
+Bulk export/import of profiles, ranked hits and hit embedding vectors.
+
+Export format is a directory of JSONL files plus a NumPy sidecar:
+  profiles.jsonl     one profile per line
+  hits.jsonl         one ranked hit per line (from saved-search feeds), with
+                     profile_id / saved_search_id / run_at
+  hit_vectors.npy    float32 [n_hits, dim]; row i belongs to line i of hits.jsonl
+Rows are streamed and written in chunks. Hits and their vectors are written in
+the same pass over the feeds (raw float32 first, wrapped in a .npy header once
+the row count is known), so memory stays flat and rows can't drift apart.
+"""
+import os, shutil
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import numpy as np
+import orjson
+from ai_job_agent.apps.api.schemas import ProfileIn
+from ai_job_agent.apps.match.embeddings import EmbeddingBackend
+from ai_job_agent.apps.match.rank import _text_of_hit
+from ai_job_agent.apps.profile.profile_store import iter_profiles, bulk_upsert_profiles
+from ai_job_agent.apps.search.hit import Hit
+from ai_job_agent.apps.watch.saved_search import iter_feed, list_saved_searches
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+def jsonl_chunks(rows: Iterable[Dict[str, Any]], chunk_size: int = 1000) -> Iterator[bytes]:
+    """Encodes rows as JSON lines, `chunk_size` rows per yielded block."""
+    for chunk in chunked(rows, chunk_size):
+        yield b"".join(orjson.dumps(r) + b"\n" for r in chunk)
+
+def iter_hit_rows() -> Iterator[Dict[str, Any]]:
+    for s in list_saved_searches():
+        for entry in iter_feed(s["id"]):
+            for item in entry["new"]:
+                yield {"profile_id": s["profile_id"], "saved_search_id": s["id"],
+                       "run_at": entry["run_at"], **item["hit"]}
+
+def _write_jsonl(path: str, rows: Iterable[Dict[str, Any]], chunk_size: int) -> int:
+    n = 0
+    with open(path, "wb") as f:
+        for block in jsonl_chunks(rows, chunk_size):
+            f.write(block)
+            n += block.count(b"\n")
+    return n
+
+def _write_hits(out_dir: str, chunk_size: int, backend: Optional[EmbeddingBackend]) -> int:
+    jsonl_path = os.path.join(out_dir, "hits.jsonl")
+    npy_path = os.path.join(out_dir, "hit_vectors.npy")
+    raw_path = npy_path + ".part"
+    n, dim = 0, 0
+    with open(jsonl_path, "wb") as f, open(raw_path if backend else os.devnull, "wb") as v:
+        for chunk in chunked(iter_hit_rows(), chunk_size):
+            f.write(b"".join(orjson.dumps(r) + b"\n" for r in chunk))
+            if backend is not None:
+                em = np.asarray(backend.embed([_text_of_hit(Hit.from_dict(r)) for r in chunk]), dtype="<f4")
+                dim = em.shape[1]
+                v.write(em.tobytes())
+            n += len(chunk)
+    if backend is not None:
+        if n:
+            with open(npy_path, "wb") as out, open(raw_path, "rb") as src:
+                np.lib.format.write_array_header_1_0(
+                    out, {"descr": "<f4", "fortran_order": False, "shape": (n, dim)})
+                shutil.copyfileobj(src, out)
+        os.remove(raw_path)
+    return n
+
+def export_dir(out_dir: str, chunk_size: int = 1000,
+               backend: Optional[EmbeddingBackend] = None) -> Dict[str, int]:
+    """Writes profiles.jsonl, hits.jsonl and (if `backend`) hit_vectors.npy into out_dir."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    os.makedirs(out_dir, exist_ok=True)
+    return {
+        "profiles": _write_jsonl(os.path.join(out_dir, "profiles.jsonl"), iter_profiles(), chunk_size),
+        "hits": _write_hits(out_dir, chunk_size, backend),
+    }
+
+def parse_profile_lines(lines: Iterable[bytes | str]) -> Iterator[Dict[str, Any]]:
+    """Validates JSONL profile rows against ProfileIn, keeping their ids."""
+    for n, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        row = orjson.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError(f"line {n}: expected a JSON object, got {type(row).__name__}")
+        d = ProfileIn(**row).model_dump()
+        if row.get("id"):
+            d["id"] = row["id"]
+        yield d
+
+def import_profiles(lines: Iterable[bytes | str]) -> int:
+    """Loads JSONL profiles into the store in a single write; nothing is written if a row is invalid."""
+    return bulk_upsert_profiles(list(parse_profile_lines(lines)))
@@ -4,6 +4,7 @@ from typing import Optional, Dict, Any
 import requests
 from requests.auth import HTTPBasicAuth
 from ai_job_agent.apps.api.settings import settings
+from ai_job_agent.apps.budget.scheduler import budget, BudgetExhausted
 
 RR_BASE = "https://api.rocketreach.co/v2/api"
 
@@ -42,12 +43,16 @@ def lookup_hr(
     # 1) Direct profile lookup by LinkedIn URL
     if linkedin_url:
         try:
+            budget.acquire("rocketreach")
             resp = requests.post(
                 f"{RR_BASE}/lookupProfile",
                 json={"profile_url": linkedin_url},
                 auth=auth,
                 timeout=20,
             )
+            if resp.status_code == 429:
+                budget.drain("rocketreach")
+                return None
             if resp.status_code == 200:
                 data = resp.json() or {}
                 # Some plans return {"profiles":[...]} others single object — handle both
@@ -57,6 +62,8 @@ def lookup_hr(
                     return _clean_person(data, fallback_company=company)
                 # Not found
             # 404/402/401 -> not found/plan/auth issues
+        except BudgetExhausted:
+            return None
         except Exception:
             pass  # fall through to people search
 
@@ -72,17 +79,23 @@ def lookup_hr(
             query["keywords"] = "recruiter OR talent acquisition OR HR"
 
         try:
+            budget.acquire("rocketreach")
             resp = requests.post(
                 f"{RR_BASE}/search/people",
                 json={"query": query, "page": 1, "per_page": 1},
                 auth=auth,
                 timeout=20,
             )
+            if resp.status_code == 429:
+                budget.drain("rocketreach")
+                return None
             if resp.status_code == 200:
                 data = resp.json() or {}
                 people = data.get("results") or data.get("people") or []
                 if people:
                     return _clean_person(people[0], fallback_company=company)
+        except BudgetExhausted:
+            return None
         except Exception:
             pass
 
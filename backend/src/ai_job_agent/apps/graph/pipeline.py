@@ -37,3 +37,8 @@ graph.add_edge("generate_email", "format_output")
 graph.add_edge("format_output", END)
 
 email_graph = graph.compile()
+
+def run_email_pipeline(profile: Dict[str, Any], job: Dict[str, Any],
+                       contact: Optional[Dict[str, Any]] = None) -> tuple[str, str]:
+    out = email_graph.invoke({"profile": profile, "job": job, "contact": contact})
+    return out.get("subject", ""), out.get("body", "")
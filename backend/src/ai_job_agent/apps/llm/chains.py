@@ -1,7 +1,9 @@
 # src/ai_job_agent/apps/llm/chains.py
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
-from ai_job_agent.apps.llm.lc import llm
+from ai_job_agent.apps.api.settings import settings
+from ai_job_agent.apps.llm.lc import llm, fallback_llm
+from ai_job_agent.apps.llm.hedge import hedged_invoke
 
 _email_prompt = ChatPromptTemplate.from_template(
     """You are a concise, professional assistant that writes short, tailored outreach emails.
@@ -31,13 +33,17 @@ Return plain text starting with 'Subject:' on the first line."""
 )
 
 compose_email_chain = (_email_prompt | llm | StrOutputParser())
+_compose_chains = {
+    settings.llm_model: compose_email_chain,
+    settings.llm_fallback_model: (_email_prompt | fallback_llm | StrOutputParser()),
+}
 
 def compose_email(profile: dict, job: dict, contact: dict | None):
     contact_block = ""
     if contact and (contact.get("name") or contact.get("title") or contact.get("company")):
         contact_block = f"Recipient: {contact.get('name','Hiring Team')}, {contact.get('title','')} at {contact.get('company','')}.\n"
 
-    text = compose_email_chain.invoke({
+    text = hedged_invoke(_compose_chains, {
         "contact_block": contact_block,
         "job_title": job.get("title",""),
         "job_company": job.get("company",""),
@@ -51,7 +57,7 @@ def compose_email(profile: dict, job: dict, contact: dict | None):
         "roles": ", ".join(profile.get("roles") or []),
         "skills": ", ".join(profile.get("skills") or []),
         "locations": ", ".join(profile.get("locations") or []),
-    }).strip()
+    }, primary=settings.llm_model, fallback=settings.llm_fallback_model).strip()
 
     subject, body = "Job application", text
     if text.lower().startswith("subject:"):
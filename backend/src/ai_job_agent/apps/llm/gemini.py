@@ -1,5 +1,7 @@
 import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted
 from ai_job_agent.apps.api.settings import settings
+from ai_job_agent.apps.budget.scheduler import budget, BudgetExhausted
 
 genai.configure(api_key=settings.google_api_key)
 
@@ -11,7 +13,12 @@ def embed(texts, model=None, task_type="retrieval_document"):
         if not t:
             out.append([])
         else:
-            resp = genai.embed_content(model=model, content=t, task_type=task_type)
+            budget.acquire("gemini_embed")
+            try:
+                resp = genai.embed_content(model=model, content=t, task_type=task_type)
+            except ResourceExhausted:
+                budget.drain("gemini_embed")
+                raise BudgetExhausted("gemini_embed")
             out.append(resp["embedding"])
     return out
 
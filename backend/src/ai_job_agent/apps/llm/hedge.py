@@ -0,0 +1,156 @@
+# src/ai_job_agent/apps/llm/hedge.py
+"""
+Latency-aware LLM invocation.
+
+A call gets a hard deadline. If the primary model has not answered by its recent
+p95 latency, a duplicate (hedge) request is fired; if the deadline gets close, the
+fallback model is fired too. The first successful response wins and the other
+in-flight requests are cancelled. Latencies are recorded per model and feed the
+next hedge delay. A call cancelled before answering (lost race, deadline) is
+recorded as a censored sample at its elapsed time, a lower bound on its latency,
+so slow calls that never finish still pull p95 up.
+
+Calls run on one long-lived event loop in a background thread, so async clients
+stay bound to a single loop and losers can really be cancelled.
+"""
+import asyncio, itertools, threading, time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+from ai_job_agent.apps.api.settings import settings
+
+class LLMDeadlineExceeded(TimeoutError):
+    pass
+
+class LatencyTracker:
+    """Rolling window of call latencies per model, plus hedge counters. Censored samples
+    (cancelled calls) are stored at their elapsed time, a lower bound on the real one."""
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window, self.min_samples = window, min_samples
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def record(self, model: str, seconds: float, censored: bool = False):
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+            if censored:
+                c = self._counters.setdefault(model, {})
+                c["censored"] = c.get("censored", 0) + 1
+
+    def count(self, model: str, event: str):
+        with self._lock:
+            c = self._counters.setdefault(model, {})
+            c[event] = c.get(event, 0) + 1
+
+    def quantile(self, model: str, q: float) -> Optional[float]:
+        with self._lock:
+            xs = sorted(self._samples.get(model, ()))
+        if len(xs) < self.min_samples:
+            return None
+        return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+    def hedge_delay(self, model: str, deadline_s: float) -> float:
+        p95 = self.quantile(model, 0.95)
+        delay = settings.llm_hedge_default_s if p95 is None else p95
+        return min(max(delay, settings.llm_hedge_min_s), deadline_s / 2)
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        with self._lock:
+            models = set(self._samples) | set(self._counters)
+            counters = {m: dict(self._counters.get(m, {})) for m in models}
+            counts = {m: len(self._samples.get(m, ())) for m in models}
+        for m in models:
+            out[m] = {
+                "samples": counts[m],
+                "p50_s": self.quantile(m, 0.50),
+                "p95_s": self.quantile(m, 0.95),
+                "p99_s": self.quantile(m, 0.99),
+                **counters[m],
+            }
+        return out
+
+latency = LatencyTracker()
+
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="llm-hedge-loop", daemon=True).start()
+
+async def _timed(runnable, model: str, inputs: Dict[str, Any]) -> Any:
+    t0 = time.monotonic()
+    try:
+        out = await runnable.ainvoke(inputs)
+    except asyncio.CancelledError:
+        latency.record(model, time.monotonic() - t0, censored=True)
+        raise
+    except Exception:
+        latency.count(model, "errors")
+        raise
+    latency.record(model, time.monotonic() - t0)
+    return out
+
+async def _race(runnables: Dict[str, Any], primary: str, fallback: Optional[str],
+                inputs: Dict[str, Any], deadline_s: float) -> Tuple[Any, str]:
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + deadline_s
+    hedge_at = start + latency.hedge_delay(primary, deadline_s)
+    fallback_at = deadline - settings.llm_fallback_margin_s
+    tasks: Dict[asyncio.Task, Tuple[str, int]] = {}   # task -> (model, launch order)
+    hedged, fell_back = False, fallback is None
+    last_error: Optional[BaseException] = None
+    order = itertools.count()
+
+    def launch(model: str):
+        tasks[asyncio.ensure_future(_timed(runnables[model], model, inputs))] = (model, next(order))
+
+    launch(primary)
+    try:
+        while True:
+            now = loop.time()
+            if now >= deadline:
+                latency.count(primary, "deadline_exceeded")
+                raise LLMDeadlineExceeded(f"LLM call exceeded {deadline_s:g}s deadline")
+            events = [deadline] + ([hedge_at] if not hedged else []) + ([fallback_at] if not fell_back else [])
+            done, _ = await asyncio.wait(tasks, timeout=max(0.0, min(events) - now),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                model, n = tasks.pop(t)
+                if t.exception() is None:
+                    if n > 0:
+                        latency.count(model, "hedge_wins")
+                    return t.result(), model
+                last_error = t.exception()
+
+            now = loop.time()
+            if not tasks:
+                # Everything in flight failed: go straight to the fallback, else give up
+                if fell_back:
+                    raise last_error
+                fell_back = True
+                latency.count(fallback, "fallbacks")
+                launch(fallback)
+            if not hedged and now >= hedge_at:
+                hedged = True
+                latency.count(primary, "hedges")
+                launch(primary)
+            if not fell_back and now >= fallback_at:
+                fell_back = True
+                latency.count(fallback, "fallbacks")
+                launch(fallback)
+    finally:
+        for t in tasks:
+            t.cancel()
+
+def hedged_invoke(runnables: Dict[str, Any], inputs: Dict[str, Any], primary: str,
+                  fallback: Optional[str] = None, deadline_s: Optional[float] = None) -> Any:
+    """Invokes `runnables[primary]` with hedging and fallback; returns the first successful output.
+    Raises LLMDeadlineExceeded if nothing answers within the deadline."""
+    deadline_s = deadline_s or settings.llm_deadline_s
+    fallback = fallback if fallback and fallback != primary and fallback in runnables else None
+    fut = asyncio.run_coroutine_threadsafe(_race(runnables, primary, fallback, inputs, deadline_s), _loop)
+    try:
+        out, _model = fut.result(timeout=deadline_s + 1)
+    except TimeoutError:
+        fut.cancel()
+        raise LLMDeadlineExceeded(f"LLM call exceeded {deadline_s:g}s deadline")
+    return out
@@ -0,0 +1,10 @@
+# src/ai_job_agent/apps/llm/lc.py
+from langchain_google_genai import ChatGoogleGenerativeAI
+from ai_job_agent.apps.api.settings import settings
+
+def make_llm(model: str) -> ChatGoogleGenerativeAI:
+    return ChatGoogleGenerativeAI(model=model, google_api_key=settings.google_api_key, temperature=0.4)
+
+llm = make_llm(settings.llm_model)
+# Faster/cheaper model used when the primary is too slow to meet the deadline
+fallback_llm = make_llm(settings.llm_fallback_model)
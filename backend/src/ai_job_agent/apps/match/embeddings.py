@@ -0,0 +1,55 @@
+from typing import List, Dict
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.metrics.pairwise import cosine_similarity
+from ai_job_agent.apps.api.settings import settings
+
+class EmbeddingBackend:
+    name: str = "base"
+    def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    def similarity(self, query: str, texts: List[str]) -> np.ndarray:
+        """Cosine similarity of each text to the query."""
+        em = self.embed([query] + list(texts))
+        return cosine_similarity(em[:1], em[1:])[0]
+
+class GeminiBackend(EmbeddingBackend):
+    name = "gemini"
+    def embed(self, texts: List[str]) -> np.ndarray:
+        from ai_job_agent.apps.llm.gemini import embed  # network client; only load when used
+        rows = embed(texts)
+        dim = max((len(r) for r in rows), default=0)
+        return np.array([r if r else np.zeros(dim) for r in rows], dtype=np.float32)
+
+class LocalHashingBackend(EmbeddingBackend):
+    """CPU-only embeddings: character n-grams hashed straight into `dim` signed buckets
+    (the hashing trick is the projection), TF-IDF weighted over the batch.
+    No network, no model download."""
+    name = "local"
+    def __init__(self, dim: int = 256, use_idf: bool = True):
+        # use_idf=False gives batch-independent vectors (e.g. for exports written in chunks)
+        self.use_idf = use_idf
+        # alternate_sign keeps inner products unbiased under bucket collisions; it also
+        # rules out sublinear_tf, which would take the log of negative counts
+        self.hasher = HashingVectorizer(analyzer="char_wb", ngram_range=(3, 5), n_features=dim,
+                                        alternate_sign=True, norm=None, lowercase=True)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        counts = self.hasher.transform([t or "" for t in texts])
+        em = TfidfTransformer(use_idf=self.use_idf).fit_transform(counts).toarray().astype(np.float32)
+        norms = np.linalg.norm(em, axis=1, keepdims=True)
+        return em / np.where(norms == 0, 1, norms)
+
+BACKENDS = {
+    "gemini": lambda: GeminiBackend(),
+    "local": lambda: LocalHashingBackend(dim=settings.local_embedding_dim),
+}
+_instances: Dict[str, EmbeddingBackend] = {}
+
+def get_backend(name: str) -> EmbeddingBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {name!r} (choose from {', '.join(BACKENDS)})")
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
@@ -0,0 +1,53 @@
+import math, re
+from collections import Counter, defaultdict
+from typing import List, Dict, Any, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+def tokenize(text: str) -> List[str]:
+    # keeps tokens like "c++", "c#", "node.js"; trailing dots are punctuation
+    return [t.rstrip(".") for t in _TOKEN.findall((text or "").lower())]
+
+def profile_terms(profile: Dict[str, Any]) -> List[str]:
+    return tokenize(" ".join((profile.get("roles") or []) + (profile.get("skills") or [])))
+
+class BM25Index:
+    """Small in-memory inverted index scored with Okapi BM25."""
+    def __init__(self, docs: List[str], k1: float = 1.5, b: float = 0.75):
+        self.k1, self.b = k1, b
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.doc_len: List[int] = []
+        for i, d in enumerate(docs):
+            tf = Counter(tokenize(d))
+            self.doc_len.append(sum(tf.values()))
+            for t, c in tf.items():
+                self.postings[t].append((i, c))
+        self.n = len(docs)
+        self.avgdl = (sum(self.doc_len) / self.n) if self.n else 0.0
+
+    def idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        return math.log(1.0 + (self.n - df + 0.5) / (df + 0.5))
+
+    def scores(self, terms: List[str]) -> List[float]:
+        out = [0.0] * self.n
+        avgdl = self.avgdl or 1.0
+        for t in set(terms):
+            plist = self.postings.get(t)
+            if not plist:
+                continue
+            idf = self.idf(t)
+            for i, tf in plist:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[i] / avgdl)
+                out[i] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return out
+
+def bm25_scores(profile: Dict[str, Any], texts: List[str]) -> List[float]:
+    """BM25 of each text against the profile's roles and skills, scaled to [0, 1]."""
+    raw = BM25Index(texts).scores(profile_terms(profile))
+    top = max(raw, default=0.0)
+    return [s / top for s in raw] if top > 0 else raw
+
+def top_indices(scores: List[float], k: int) -> List[int]:
+    """Indices of the k highest scores; ties keep the original (portal) order."""
+    return sorted(range(len(scores)), key=lambda i: (-scores[i], i))[:k]
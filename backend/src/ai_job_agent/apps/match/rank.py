@@ -1,16 +1,43 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 from rapidfuzz import fuzz
-from ai_job_agent.apps.llm.gemini import embed
+from ai_job_agent.apps.api.settings import settings
+from ai_job_agent.apps.budget.scheduler import BudgetExhausted
+from ai_job_agent.apps.match.embeddings import get_backend
+from ai_job_agent.apps.match.lexical import bm25_scores, top_indices
+from ai_job_agent.apps.search.hit import Hit
 
-def _text_of_hit(h: Dict[str, Any]) -> str:
+def _text_of_hit(h: Hit) -> str:
     return " ".join([
-        h.get("title",""), h.get("company","") or "",
-        h.get("location","") or "", h.get("snippet","") or ""
+        h.title or "", h.company or "",
+        h.location or "", h.snippet or ""
     ]).strip()
 
-def rank_jobs(profile: Dict[str, Any], hits: List[Dict[str, Any]], top_k: int = 20) -> List[Dict[str, Any]]:
+def lexical_order(profile: Dict[str, Any], hits: List[Hit]) -> List[Hit]:
+    """Hits best-first by BM25 against the profile, e.g. to spend detail fetches on the
+    likeliest candidates rather than on whichever portal answered first."""
+    lexical = bm25_scores(profile, [_text_of_hit(h) for h in hits])
+    return [hits[i] for i in top_indices(lexical, len(hits))]
+
+def _semantic_scores(query: str, job_texts: List[str], top_k: int) -> Tuple[List[int], np.ndarray]:
+    """Cosine similarity of job texts to the query with the configured backend.
+    Returns the indices that were scored (hybrid mode scores a subset) and their scores."""
+    idx = list(range(len(job_texts)))
+    name = settings.embedding_backend
+    if name == "hybrid":
+        # Local first pass over everything; Gemini re-scores only the best candidates
+        first = get_backend("local").similarity(query, job_texts)
+        idx = top_indices(first.tolist(), max(top_k, settings.embedding_rescore_k))
+        name = "gemini"
+    texts = [job_texts[i] for i in idx]
+    try:
+        return idx, get_backend(name).similarity(query, texts)
+    except BudgetExhausted:
+        # Embedding budget is gone: degrade to the offline backend
+        return idx, get_backend("local").similarity(query, texts)
+
+def rank_jobs(profile: Dict[str, Any], hits: List[Hit], top_k: int = 20) -> List[Hit]:
+    """Scores hits in place (sets ``Hit.score``) and returns the top_k, best first."""
     if not hits: return []
     skills = ", ".join(profile.get("skills") or [])
     roles = ", ".join(profile.get("roles") or [])
@@ -18,23 +45,24 @@ def rank_jobs(profile: Dict[str, Any], hits: List[Dict[str, Any]], top_k: int =
     query = f"roles: {roles}; skills: {skills}; locations: {locs}; exp: {profile.get('years_experience',0)} years"
 
     job_texts = [_text_of_hit(h) for h in hits]
-    em_q = np.array(embed([query])[0]).reshape(1,-1)
-    em_jobs = embed(job_texts)
-    if len(em_jobs)==0:
-        return []
-    em_jobs = np.array([e if e else np.zeros_like(em_q[0]) for e in em_jobs])
+    lexical = bm25_scores(profile, job_texts)
+
+    # Lexical prefilter: only the best factor*top_k candidates go on to be embedded
+    keep = settings.rank_prefilter_factor * top_k
+    idx = top_indices(lexical, keep) if keep and len(hits) > keep else range(len(hits))
+
+    scored, cos = _semantic_scores(query, [job_texts[i] for i in idx], top_k)
+    idx = [idx[i] for i in scored]
+    hits = [hits[i] for i in idx]
+    lexical = np.array([lexical[i] for i in idx])
 
-    cos = cosine_similarity(em_q, em_jobs)[0]
     role_pref = (profile.get("roles") or [""])[0]
-    fuzzy = np.array([fuzz.token_set_ratio(role_pref, h.get("title",""))/100.0 for h in hits])
+    fuzzy = np.array([fuzz.token_set_ratio(role_pref, h.title)/100.0 for h in hits])
 
-    scores = 0.7*cos + 0.3*fuzzy
+    w_lex = settings.rank_lexical_weight
+    scores = (1-w_lex)*(0.7*cos + 0.3*fuzzy) + w_lex*lexical
 
-    ranked = []
     for h, s in zip(hits, scores):
-        h2 = h.copy()
-        h2["score"] = float(round(float(s), 3))
-        ranked.append(h2)
+        h.score = float(round(float(s), 3))
 
-    ranked.sort(key=lambda x: x["score"], reverse=True)
-    return ranked[:top_k]
+    return sorted(hits, key=lambda x: x.score, reverse=True)[:top_k]
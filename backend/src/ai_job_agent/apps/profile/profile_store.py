@@ -1,5 +1,5 @@
 import json, os, uuid
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator
 from ai_job_agent.apps.api.settings import settings
 
 PROFILE_PATH = os.path.join(settings.data_dir, "profiles.json")
@@ -12,8 +12,11 @@ def _load() -> Dict[str, Any]:
         return json.load(f)
 
 def _save(data: Dict[str, Any]):
-    with open(PROFILE_PATH,"w",encoding="utf-8") as f:
+    # write-then-rename so readers never see a half-written file
+    tmp = PROFILE_PATH + ".tmp"
+    with open(tmp,"w",encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, PROFILE_PATH)
 
 def upsert_profile(p: Dict[str, Any]) -> str:
     data = _load()
@@ -25,3 +28,19 @@ def upsert_profile(p: Dict[str, Any]) -> str:
 
 def get_profile(pid: str) -> Dict[str, Any] | None:
     return _load().get(pid)
+
+def iter_profiles() -> Iterator[Dict[str, Any]]:
+    """All profiles from a single read of the store."""
+    yield from _load().values()
+
+def bulk_upsert_profiles(profiles: Iterable[Dict[str, Any]]) -> int:
+    """Upserts many profiles with one load and one atomic save; returns the count."""
+    data = _load()
+    n = 0
+    for p in profiles:
+        pid = p.get("id") or str(uuid.uuid4())
+        p["id"] = pid
+        data[pid] = p
+        n += 1
+    _save(data)
+    return n
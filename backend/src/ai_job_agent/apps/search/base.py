@@ -1,6 +1,7 @@
-from typing import List, Dict, Any
+from typing import List
+from .hit import Hit
 
 class Searcher:
     portal: str = "generic"
-    def search(self, query: str, max_results: int = 20) -> List[Dict[str, Any]]:
+    def search(self, query: str, max_results: int = 20, timeout: float = 25) -> List[Hit]:
         raise NotImplementedError
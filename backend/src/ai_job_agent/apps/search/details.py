@@ -0,0 +1,228 @@
+# src/ai_job_agent/apps/search/details.py
+"""
+Fills in company/location for SERP hits by fetching the posting pages.
+
+Pages are fetched concurrently with a per-host concurrency cap and minimum
+request spacing. Parsed details are cached with the page's ETag / Last-Modified
+so a repeat fetch is usually a 304 or no request at all. Parsing prefers schema.org
+JSON-LD `JobPosting` data and falls back to portal-specific HTML selectors.
+"""
+import json, os, sqlite3, threading, time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+from ai_job_agent.apps.api.settings import settings
+from ai_job_agent.apps.search.hit import Hit
+from ai_job_agent.utils.http import get_conditional
+
+# (company selector, location selector) tried when a page has no JSON-LD
+HTML_SELECTORS: Dict[str, List[Tuple[str, str]]] = {
+    "linkedin": [(".topcard__org-name-link", ".topcard__flavor--bullet")],
+    "indeed": [("[data-testid=inlineHeader-companyName]", "[data-testid=inlineHeader-companyLocation]"),
+               ("[data-company-name]", "[data-testid=job-location]")],
+    "naukri": [("[class*=jd-header-comp-name] a", "[class*=jhc__location] a")],
+    "hirist": [("[class*=company-name]", "[class*=location]")],
+    "timesjobs": [(".jd-header h2", ".top-jd-dtl .location")],
+}
+GENERIC_SELECTORS = [("[itemprop=hiringOrganization] [itemprop=name]", "[itemprop=jobLocation]")]
+
+# ---------------------- Parsing ----------------------
+
+def _iter_nodes(data: Any):
+    if isinstance(data, list):
+        for d in data:
+            yield from _iter_nodes(d)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _iter_nodes(data["@graph"])
+
+def _is_job_posting(node: Dict[str, Any]) -> bool:
+    t = node.get("@type")
+    return t == "JobPosting" or (isinstance(t, list) and "JobPosting" in t)
+
+def _name(v: Any) -> Optional[str]:
+    if isinstance(v, dict):
+        v = v.get("name")
+    return v.strip() if isinstance(v, str) and v.strip() else None
+
+def _location(posting: Dict[str, Any]) -> Optional[str]:
+    locs = posting.get("jobLocation")
+    locs = locs if isinstance(locs, list) else [locs] if locs else []
+    out = []
+    for loc in locs:
+        addr = loc.get("address") if isinstance(loc, dict) else None
+        if isinstance(addr, str):
+            parts = [addr]
+        elif isinstance(addr, dict):
+            parts = [_name(addr.get(k)) for k in ("addressLocality", "addressRegion", "addressCountry")]
+        else:
+            parts = [_name(loc)]
+        text = ", ".join(dict.fromkeys(p for p in parts if p))
+        if text and text not in out:
+            out.append(text)
+    if not out and posting.get("jobLocationType") == "TELECOMMUTE":
+        out.append("Remote")
+    return "; ".join(out) or None
+
+def parse_job_page(html: str, portal: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """Returns {"company": ..., "location": ...} (values may be None)."""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(tag.string or "")
+        except ValueError:
+            continue
+        for node in _iter_nodes(data):
+            if _is_job_posting(node):
+                company, location = _name(node.get("hiringOrganization")), _location(node)
+                if company or location:
+                    return {"company": company, "location": location}
+
+    for company_sel, location_sel in HTML_SELECTORS.get(portal or "", []) + GENERIC_SELECTORS:
+        c, l = soup.select_one(company_sel), soup.select_one(location_sel)
+        company = c.get_text(" ", strip=True) if c else None
+        location = l.get_text(" ", strip=True) if l else None
+        if company or location:
+            return {"company": company or None, "location": location or None}
+    return {"company": None, "location": None}
+
+# ---------------------- Details cache ----------------------
+
+class DetailCache:
+    """SQLite cache of parsed details per URL plus the validators for conditional GETs.
+    Only the parsed fields are kept (not the HTML), and rows older than `max_age` are pruned."""
+    def __init__(self, path: str, max_age: float = 7 * 86400):
+        self.path, self.max_age = path, max_age
+        self._local = threading.local()
+        self._pruned_at = 0.0
+        c = self._conn()
+        c.execute(
+            """CREATE TABLE IF NOT EXISTS job_details (
+                   url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,
+                   company TEXT, location TEXT, fetched_at REAL NOT NULL)""")
+        c.execute("CREATE INDEX IF NOT EXISTS job_details_fetched ON job_details(fetched_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], Dict[str, Optional[str]], float]]:
+        row = self._conn().execute(
+            "SELECT etag, last_modified, company, location, fetched_at FROM job_details WHERE url=?",
+            (url,)).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], {"company": row[2], "location": row[3]}, row[4]
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], details: Dict[str, Optional[str]]):
+        self._conn().execute("INSERT OR REPLACE INTO job_details VALUES (?,?,?,?,?,?)",
+                             (url, etag, last_modified, details["company"], details["location"], time.time()))
+
+    def touch(self, url: str):
+        self._conn().execute("UPDATE job_details SET fetched_at=? WHERE url=?", (time.time(), url))
+
+    def prune(self, every: float = 3600):
+        now = time.time()
+        if now - self._pruned_at >= every:
+            self._pruned_at = now
+            self._conn().execute("DELETE FROM job_details WHERE fetched_at < ?", (now - self.max_age,))
+
+class DeadlinePassed(Exception):
+    pass
+
+class HostGate:
+    """Per-host politeness: at most `concurrency` requests in flight and `interval` s between starts."""
+    def __init__(self, concurrency: int, interval: float):
+        self.concurrency, self.interval = concurrency, interval
+        self._lock = threading.Lock()
+        self._sems: Dict[str, threading.Semaphore] = {}
+        self._next: Dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, host: str, deadline: Optional[float] = None):
+        """Waits for a request slot on `host`. Raises DeadlinePassed (without reserving a slot)
+        if the slot would start after `deadline` (a time.monotonic() value)."""
+        with self._lock:
+            sem = self._sems.setdefault(host, threading.Semaphore(self.concurrency))
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not sem.acquire(timeout=timeout):
+            raise DeadlinePassed(host)
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next.get(host, 0.0))
+                if deadline is not None and start >= deadline:
+                    raise DeadlinePassed(host)
+                self._next[host] = start + self.interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+        finally:
+            sem.release()
+
+# ---------------------- Fetching ----------------------
+
+class DetailFetcher:
+    def __init__(self, cache: DetailCache, gate: HostGate, workers: int = 8,
+                 fresh_seconds: float = 3600, timeout: float = 10):
+        self.cache, self.gate = cache, gate
+        self.fresh_seconds, self.timeout = fresh_seconds, timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-details")
+
+    def fetch_details(self, url: str, portal: Optional[str] = None,
+                      deadline: Optional[float] = None) -> Dict[str, Optional[str]]:
+        cached = self.cache.get(url)
+        if cached and time.time() - cached[3] < self.fresh_seconds:
+            return cached[2]
+        etag, last_modified = (cached[0], cached[1]) if cached else (None, None)
+        with self.gate.slot(urlparse(url).netloc.lower(), deadline):
+            timeout = self.timeout if deadline is None else max(0.5, min(self.timeout, deadline - time.monotonic()))
+            r = get_conditional(url, etag=etag, last_modified=last_modified, timeout=timeout)
+        if r.status_code == 304 and cached:
+            self.cache.touch(url)
+            return cached[2]
+        details = parse_job_page(r.text, portal)
+        self.cache.put(url, r.headers.get("ETag"), r.headers.get("Last-Modified"), details)
+        return details
+
+    def _details(self, h: Hit, deadline: Optional[float]) -> Optional[Dict[str, Optional[str]]]:
+        try:
+            return self.fetch_details(h.url, h.portal, deadline)
+        except Exception:
+            return None  # unreachable/blocked pages or deadline passed: keep the SERP data
+
+    def fill(self, hits: List[Hit], limit: int, deadline: Optional[float] = None) -> List[Hit]:
+        """Fills company/location in place for the first `limit` hits that lack them, so pass
+        hits best-first (see match.rank.lexical_order). Pages not fetched within `deadline`
+        seconds are skipped."""
+        todo = [h for h in hits if h.url and not (h.company and h.location)][:limit]
+        if not todo:
+            return hits
+        self.cache.prune()
+        until = None if deadline is None else time.monotonic() + deadline
+        futures = {self._pool.submit(self._details, h, until): h for h in todo}
+        done, pending = wait(futures, timeout=deadline)
+        for f in pending:
+            f.cancel()
+        for f in done:
+            d = f.result()
+            if d:
+                h = futures[f]
+                h.company = h.company or d["company"] or ""
+                h.location = h.location or d["location"]
+        return hits
+
+os.makedirs(settings.data_dir, exist_ok=True)
+detail_fetcher = DetailFetcher(
+    DetailCache(os.path.join(settings.data_dir, "page_cache.sqlite3"), max_age=settings.detail_cache_max_age_s),
+    HostGate(settings.detail_per_host, settings.detail_host_interval_s),
+    workers=settings.detail_fetch_workers,
+    fresh_seconds=settings.detail_cache_fresh_s,
+)
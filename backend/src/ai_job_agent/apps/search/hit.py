@@ -0,0 +1,31 @@
+from dataclasses import dataclass, fields
+from typing import Optional, Dict, Any
+
+@dataclass(slots=True)
+class Hit:
+    """Internal job hit. Kept slotted so large batches stay compact; converted
+    to the pydantic JobHit only at the API boundary."""
+    title: str = ""
+    company: str = ""
+    location: Optional[str] = None
+    url: Optional[str] = None
+    portal: Optional[str] = None
+    snippet: Optional[str] = None
+    score: float = 0.0
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Hit":
+        return cls(
+            title=d.get("title") or "",
+            company=d.get("company") or "",
+            location=d.get("location"),
+            url=d.get("url"),
+            portal=d.get("portal"),
+            snippet=d.get("snippet"),
+            score=float(d.get("score") or 0.0),
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {f: getattr(self, f) for f in HIT_FIELDS}
+
+HIT_FIELDS = tuple(f.name for f in fields(Hit))
@@ -0,0 +1,184 @@
+# src/ai_job_agent/apps/search/portal_stats.py
+"""
+Per-portal yield statistics and the result allocation built on them.
+
+For every portal we track calls, latency (EWMA mean/variance), hits returned,
+duplicates, how many of its hits were ranked (scored) and how many of those
+survived into the ranked top_k. A request's result budget is then split
+Thompson-sampling style: each portal draws a yield from
+Beta(prior + survivors, prior + scored - survivors), discounted by its duplicate
+rate, and gets a proportional share. Portals with fewer than PORTAL_EXPLORE_CALLS
+calls always get a minimum share so their posterior can become informative. A portal
+with history whose share falls under the minimum is skipped, except that with
+probability PORTAL_EXPLORE_RATE it is probed with the minimum anyway. Counts decay
+with a half-life of PORTAL_STATS_HALF_LIFE_S, so a portal starved on stale history
+drifts back to the prior and gets explored again.
+Stats live in SQLite under DATA_DIR so all workers learn from the same history.
+"""
+import math, os, random, sqlite3, threading, time
+from typing import Dict, Any, Iterable, List, Tuple
+from ai_job_agent.apps.api.settings import settings
+from ai_job_agent.apps.search.hit import Hit
+
+_COUNTS = ("calls", "errors", "returned", "duplicates", "scored", "survivors")
+_COLUMNS = _COUNTS + ("lat_mean", "lat_var")
+
+class PortalStats:
+    def __init__(self, path: str, alpha: float = 0.2, prior: Tuple[float, float] = (1.0, 1.0)):
+        self.path, self.alpha, self.prior = path, alpha, prior
+        self._local = threading.local()
+        self._conn().execute(
+            """CREATE TABLE IF NOT EXISTS portal_stats (
+                   portal TEXT PRIMARY KEY,
+                   calls REAL NOT NULL DEFAULT 0, errors REAL NOT NULL DEFAULT 0,
+                   returned REAL NOT NULL DEFAULT 0, duplicates REAL NOT NULL DEFAULT 0,
+                   scored REAL NOT NULL DEFAULT 0, survivors REAL NOT NULL DEFAULT 0,
+                   lat_mean REAL, lat_var REAL NOT NULL DEFAULT 0, updated REAL)""")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _decay_factor(updated: float | None, now: float) -> float:
+        if updated is None:
+            return 1.0
+        return 0.5 ** (max(0.0, now - updated) / settings.portal_stats_half_life_s)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current stats per portal, with counts decayed to now."""
+        now = time.time()
+        rows = self._conn().execute(f"SELECT portal, {', '.join(_COLUMNS)}, updated FROM portal_stats").fetchall()
+        out: Dict[str, Dict[str, Any]] = {}
+        for r in rows:
+            s = dict(zip(_COLUMNS, r[1:-1]))
+            f = self._decay_factor(r[-1], now)
+            out[r[0]] = {**s, **{k: s[k] * f for k in _COUNTS}}
+        return out
+
+    # ---------------------- Recording ----------------------
+
+    def _decay(self, c: sqlite3.Connection, portal: str, now: float):
+        # Bring a row's counts forward to `now` before adding to them (inside the caller's transaction)
+        row = c.execute("SELECT updated FROM portal_stats WHERE portal=?", (portal,)).fetchone()
+        if row is None:
+            return
+        f = self._decay_factor(row[0], now)
+        c.execute(f"UPDATE portal_stats SET {', '.join(f'{k} = {k} * ?' for k in _COUNTS)}, updated = ? WHERE portal=?",
+                  (*([f] * len(_COUNTS)), now, portal))
+
+    def record_call(self, portal: str, seconds: float, returned: int, duplicates: int, error: bool = False):
+        c = self._conn()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            row = c.execute("SELECT lat_mean, lat_var FROM portal_stats WHERE portal=?", (portal,)).fetchone()
+            mean, var = row if row and row[0] is not None else (seconds, 0.0)
+            # EWMA mean/variance of latency
+            d = seconds - mean
+            mean, var = mean + self.alpha * d, (1 - self.alpha) * (var + self.alpha * d * d)
+            now = time.time()
+            self._decay(c, portal, now)
+            c.execute(
+                """INSERT INTO portal_stats(portal, calls, errors, returned, duplicates, lat_mean, lat_var, updated)
+                   VALUES (?, 1, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(portal) DO UPDATE SET
+                     calls = calls + 1, errors = errors + excluded.errors,
+                     returned = returned + excluded.returned, duplicates = duplicates + excluded.duplicates,
+                     lat_mean = excluded.lat_mean, lat_var = excluded.lat_var, updated = excluded.updated""",
+                (portal, int(error), returned, duplicates, mean, var, now))
+            c.execute("COMMIT")
+        except Exception:
+            c.execute("ROLLBACK")
+            raise
+
+    def record_survivors(self, ranked: Iterable[Hit], candidates: Iterable[Hit]):
+        """Credits each portal for the hits it placed in the ranked top_k, out of the
+        `candidates` that were ranked (not every hit a call returned gets ranked)."""
+        counts: Dict[str, List[int]] = {}
+        for i, hits in enumerate((candidates, ranked)):
+            for h in hits:
+                if h.portal:
+                    counts.setdefault(h.portal, [0, 0])[i] += 1
+        c = self._conn()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            for portal, (scored, survivors) in counts.items():
+                self._decay(c, portal, now)
+                c.execute("UPDATE portal_stats SET scored = scored + ?, survivors = survivors + ? WHERE portal=?",
+                          (scored, survivors, portal))
+            c.execute("COMMIT")
+        except Exception:
+            c.execute("ROLLBACK")
+            raise
+
+    # ---------------------- Allocation ----------------------
+
+    def timeout_for(self, s: Dict[str, Any] | None) -> float:
+        if not s or s["lat_mean"] is None:
+            return settings.portal_timeout_max_s
+        t = s["lat_mean"] + 3 * math.sqrt(max(0.0, s["lat_var"]))
+        return min(settings.portal_timeout_max_s, max(settings.portal_timeout_min_s, t))
+
+    def _weight(self, s: Dict[str, Any] | None, rnd: random.Random) -> float:
+        a, b = self.prior
+        if not s:
+            return rnd.betavariate(a, b)
+        survivors = min(s["survivors"], s["scored"])
+        dup_rate = s["duplicates"] / s["returned"] if s["returned"] else 0.0
+        return rnd.betavariate(a + survivors, b + s["scored"] - survivors) * (1 - dup_rate)
+
+    def allocate(self, portals: List[str], total: int,
+                 rnd: random.Random | None = None) -> Dict[str, Tuple[int, float]]:
+        """Splits `total` results across portals; returns {portal: (max_results, timeout_s)}.
+        Portals left out of the dict are skipped for this request."""
+        if not portals or total <= 0:
+            return {}
+        rnd = rnd or random
+        stats = self.snapshot()
+        weights = {p: self._weight(stats.get(p), rnd) for p in portals}
+        wsum = sum(weights.values()) or 1.0
+        order = sorted(portals, key=lambda p: -weights[p])
+        min_n = max(1, min(settings.portal_min_results, total))
+        # Portals without enough history are guaranteed a floor (at least one result each,
+        # as many as the budget covers) instead of being dropped on a noisy prior draw;
+        # portals whose share is under the minimum are occasionally probed the same way
+        cold = [p for p in portals if (stats.get(p) or {}).get("calls", 0) < settings.portal_explore_calls]
+        starved = [p for p in portals if p not in cold and total * weights[p] / wsum < min_n]
+        probe = [p for p in starved if rnd.random() < settings.portal_explore_rate]
+        rnd.shuffle(cold)
+        rnd.shuffle(probe)
+        explore = cold + probe
+        floor = max(1, min(min_n, total // len(explore))) if explore else 0
+        alloc = {p: floor for p in explore[:total // floor]} if explore else {}
+        rest = total - sum(alloc.values())
+        for p in order:
+            n = int(rest * weights[p] / wsum)
+            if p in alloc:
+                alloc[p] += n
+            elif n >= min_n:
+                alloc[p] = n
+        # rounding / dropped portals: hand the remainder to the best-weighted portal
+        alloc[order[0]] = alloc.get(order[0], 0) + total - sum(alloc.values())
+        return {p: (n, self.timeout_for(stats.get(p))) for p, n in alloc.items() if n > 0}
+
+    def report(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for p, s in self.snapshot().items():
+            out[p] = {
+                **s,
+                **{k: round(s[k], 2) for k in _COUNTS},
+                "timeout_s": round(self.timeout_for(s), 2),
+                "survival_rate": round(s["survivors"] / s["scored"], 4) if s["scored"] else None,
+                "duplicate_rate": round(s["duplicates"] / s["returned"], 4) if s["returned"] else None,
+                # SerpAPI bills per call, so this is the cost of one top_k result
+                "calls_per_topk_hit": round(s["calls"] / s["survivors"], 3) if s["survivors"] else None,
+            }
+        return out
+
+os.makedirs(settings.data_dir, exist_ok=True)
+portal_stats = PortalStats(os.path.join(settings.data_dir, "portal_stats.sqlite3"))
@@ -1,5 +1,11 @@
-from typing import List, Dict, Any
+import math, time
+from typing import List, Dict, Any, Iterable, Optional
+import requests
+from ai_job_agent.apps.api.settings import settings
+from ai_job_agent.apps.budget.scheduler import BudgetExhausted
 from .base import Searcher
+from .hit import Hit
+from .portal_stats import portal_stats
 from .serpapi_client import serp_search_site
 
 # Simple adapters using public site: searches via SerpAPI
@@ -17,16 +23,55 @@ class PortalSearcher(Searcher):
         self.portal = portal
         self.domain = DOMAIN_MAP.get(portal, portal)
 
-    def search(self, query: str, max_results: int = 20) -> List[Dict[str, Any]]:
-        rows = serp_search_site(self.domain, query, max_results)
-        out=[]
-        for r in rows:
-            out.append({
-                "title": r.get("title",""),
-                "company": "",
-                "location": None,
-                "url": r.get("url"),
-                "portal": self.portal,
-                "snippet": r.get("snippet",""),
-            })
-        return out
+    def search(self, query: str, max_results: int = 20, timeout: float = 25) -> List[Hit]:
+        rows = serp_search_site(self.domain, query, max_results, timeout=timeout)
+        return [
+            Hit(
+                title=r.get("title") or "",
+                url=r.get("url"),
+                portal=self.portal,
+                snippet=r.get("snippet") or "",
+            )
+            for r in rows
+        ]
+
+# Construct all portal searchers once
+PORTAL_SEARCHERS = {name: PortalSearcher(name) for name in DOMAIN_MAP.keys()}
+
+def build_query(profile: Dict[str, Any]) -> str:
+    roles  = profile.get("roles") or []
+    locs   = profile.get("locations") or []
+    skills = " ".join(profile.get("skills") or [])
+    return f"{' OR '.join(roles)} {skills} {' OR '.join(locs)}".strip()
+
+def search_portals(query: str, portals: Iterable[str], max_results: int,
+                   overfetch: Optional[float] = None) -> List[Hit]:
+    """Fans the query out to the known portals. The result budget and per-portal timeouts
+    are allocated from historical yield (see portal_stats); duplicate URLs are dropped.
+    Fetches a bit more than max_results so ranking has a choice and survival into the
+    top_k says something about a portal (SerpAPI bills per call, not per result);
+    `overfetch` overrides PORTAL_OVERFETCH, e.g. 1.0 when every result is delivered."""
+    portals = [p for p in dict.fromkeys(portals) if p in PORTAL_SEARCHERS]
+    budget = math.ceil(max_results * (settings.portal_overfetch if overfetch is None else overfetch))
+    out: List[Hit] = []
+    seen_urls = set()
+    for p, (n, timeout) in portal_stats.allocate(portals, budget).items():
+        t0 = time.monotonic()
+        try:
+            hits = PORTAL_SEARCHERS[p].search(query, max_results=n, timeout=timeout)
+        except BudgetExhausted:
+            # skipped or throttled, not an answer from the portal: nothing to learn, and the
+            # SerpAPI budget is shared, so the remaining portals would be throttled too
+            break
+        except requests.RequestException:
+            portal_stats.record_call(p, time.monotonic() - t0, 0, 0, error=True)
+            continue
+        dups = 0
+        for h in hits:
+            if h.url and h.url in seen_urls:
+                dups += 1
+                continue
+            seen_urls.add(h.url)
+            out.append(h)
+        portal_stats.record_call(p, time.monotonic() - t0, len(hits), dups)
+    return out
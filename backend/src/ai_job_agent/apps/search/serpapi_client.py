@@ -1,19 +1,26 @@
 import requests
 from typing import List, Dict, Any
 from ai_job_agent.apps.api.settings import settings
+from ai_job_agent.apps.budget.scheduler import budget, BudgetExhausted
 
 BASE = "https://serpapi.com/search.json"
 
-def serp_search_site(site: str, q: str, max_results: int=10) -> List[Dict[str, Any]]:
+def serp_search_site(site: str, q: str, max_results: int=10, timeout: float=25) -> List[Dict[str, Any]]:
+    """Raises BudgetExhausted when the call was skipped or throttled (no key, local budget
+    spent, upstream 429), so callers can tell that apart from a search with no results."""
     if not settings.serpapi_key:
-        return []
+        raise BudgetExhausted("serpapi")  # no key: no budget at all
     params = {
         "engine": "google",
         "q": f"site:{site} {q}",
         "num": max_results,
         "api_key": settings.serpapi_key
     }
-    r = requests.get(BASE, params=params, timeout=25)
+    budget.acquire("serpapi")
+    r = requests.get(BASE, params=params, timeout=timeout)
+    if r.status_code == 429:
+        budget.drain("serpapi")
+        raise BudgetExhausted("serpapi")
     r.raise_for_status()
     js = r.json()
     results = []
@@ -0,0 +1,214 @@
+# src/ai_job_agent/apps/watch/saved_search.py
+"""
+Saved searches that re-run on a schedule and only process postings that are new.
+
+Each saved search keeps a seen-set of {url: content fingerprint}. A run still
+queries the portals, but embedding, ranking, contact enrichment and email drafts
+are only spent on postings whose URL is unseen or whose content changed. Every
+fetched posting is marked seen, and runs fetch exactly max_results (no over-fetch),
+so each feed entry holds all postings new since the previous run. The result of
+each run is appended to a per-search JSONL delta feed.
+"""
+import fcntl, hashlib, json, os, threading, time, uuid
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+from ai_job_agent.apps.api.settings import settings
+from ai_job_agent.apps.budget.scheduler import priority, BATCH
+from ai_job_agent.apps.contacts.rocketreach import lookup_hr
+from ai_job_agent.apps.graph.pipeline import run_email_pipeline
+from ai_job_agent.apps.match.rank import rank_jobs, lexical_order
+from ai_job_agent.apps.profile.profile_store import get_profile
+from ai_job_agent.apps.search.details import detail_fetcher
+from ai_job_agent.apps.search.hit import Hit
+from ai_job_agent.apps.search.portals import PORTAL_SEARCHERS, build_query, search_portals
+
+STORE_PATH = os.path.join(settings.data_dir, "saved_searches.json")
+LOCK_PATH = STORE_PATH + ".lock"
+FEED_DIR = os.path.join(settings.data_dir, "watch_feed")
+os.makedirs(FEED_DIR, exist_ok=True)
+
+@contextmanager
+def _locked():
+    # Several uvicorn workers share the file; serialise read-modify-write cycles
+    with open(LOCK_PATH, "a") as lf:
+        fcntl.flock(lf, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lf, fcntl.LOCK_UN)
+
+def _load() -> Dict[str, Any]:
+    if not os.path.exists(STORE_PATH):
+        return {}
+    with open(STORE_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _save(data: Dict[str, Any]):
+    tmp = STORE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, STORE_PATH)
+
+def fingerprint(h: Hit) -> str:
+    raw = "\x1f".join(" ".join((v or "").lower().split()) for v in (h.title, h.company, h.location, h.snippet))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+def _seen_key(h: Hit, fp: str) -> str:
+    return h.url or f"fp:{fp}"
+
+# ---------------------- Store ----------------------
+
+def create_saved_search(s: Dict[str, Any]) -> Dict[str, Any]:
+    with _locked():
+        data = _load()
+        sid = str(uuid.uuid4())
+        s = {**s, "id": sid, "seen": {}, "last_run_at": None, "next_run_at": time.time()}
+        data[sid] = s
+        _save(data)
+    return s
+
+def list_saved_searches(profile_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    return [s for s in _load().values() if not profile_id or s["profile_id"] == profile_id]
+
+def get_saved_search(sid: str) -> Dict[str, Any] | None:
+    return _load().get(sid)
+
+def delete_saved_search(sid: str) -> bool:
+    with _locked():
+        data = _load()
+        found = data.pop(sid, None) is not None
+        _save(data)
+    feed = os.path.join(FEED_DIR, f"{sid}.jsonl")
+    if found and os.path.exists(feed):
+        os.remove(feed)
+    return found
+
+def iter_feed(sid: str) -> Iterator[Dict[str, Any]]:
+    """Streams a saved search's feed entries, oldest first."""
+    path = os.path.join(FEED_DIR, f"{sid}.jsonl")
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def read_feed(sid: str, since: float = 0.0) -> List[Dict[str, Any]]:
+    return [e for e in iter_feed(sid) if e["run_at"] > since]
+
+# ---------------------- Runs ----------------------
+
+def run_saved_search(sid: str) -> Dict[str, Any] | None:
+    """Runs one saved search and returns its delta feed entry (None if it no longer exists)."""
+    s = get_saved_search(sid)
+    if not s:
+        return None
+    profile = get_profile(s["profile_id"])
+    if not profile:
+        return None
+
+    portals = s.get("portals") or profile.get("portals") or list(PORTAL_SEARCHERS.keys())
+    seen: Dict[str, str] = s.get("seen") or {}
+    items: List[Dict[str, Any]] = []
+    with priority(BATCH):
+        # No over-fetch: every new posting fits in max_results and is delivered, so marking
+        # everything fetched as seen never hides a posting from the feed
+        hits = search_portals(build_query(profile), portals, s["max_results"], overfetch=1.0)
+        new, fresh_seen = [], {}
+        for h in hits:
+            fp = fingerprint(h)
+            key = _seen_key(h, fp)
+            if seen.get(key) != fp and key not in fresh_seen:
+                new.append(h)
+            fresh_seen[key] = fp
+
+        detail_fetcher.fill(lexical_order(profile, new), settings.detail_fetch_limit, settings.detail_fetch_deadline_s)
+        # Everything new is delivered, so survival here says nothing about a portal's yield;
+        # portal_stats only learns survival from search/pipeline requests
+        ranked = rank_jobs(profile, new, top_k=s["max_results"])
+        for h in ranked:
+            contact = None
+            if s.get("enrich") and h.company:
+                contact = lookup_hr(company=h.company, role_hint=h.title or "recruiter", job_url=h.url)
+            item: Dict[str, Any] = {"hit": h.as_dict(), "contact": contact}
+            if s.get("draft"):
+                try:
+                    item["subject"], item["body"] = run_email_pipeline(profile, h.as_dict(), contact)
+                except Exception:
+                    # deadline or provider error: leave this draft out, but keep the posting and
+                    # finish the run so the embeddings/lookups already paid for aren't redone
+                    pass
+            items.append(item)
+
+    entry = {"run_at": time.time(), "fetched": len(hits), "new": items}
+    with open(os.path.join(FEED_DIR, f"{sid}.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    with _locked():
+        data = _load()
+        if sid in data:
+            data[sid]["seen"] = {**data[sid].get("seen", {}), **fresh_seen}
+            data[sid]["last_run_at"] = entry["run_at"]
+            _save(data)
+    return entry
+
+def queue_run(sid: str) -> Dict[str, Any] | None:
+    """Marks a saved search due now; the scheduler picks it up on its next pass."""
+    with _locked():
+        data = _load()
+        if sid not in data:
+            return None
+        data[sid]["next_run_at"] = time.time()
+        _save(data)
+        return data[sid]
+
+def _claim_due(now: float) -> List[str]:
+    # Claiming pushes next_run_at forward under the lock, so only one worker runs each search
+    with _locked():
+        data = _load()
+        due = [sid for sid, s in data.items() if (s.get("next_run_at") or 0) <= now]
+        for sid in due:
+            data[sid]["next_run_at"] = now + data[sid]["interval_minutes"] * 60
+        if due:
+            _save(data)
+    return due
+
+class SavedSearchScheduler:
+    """Background thread that periodically runs due saved searches."""
+    def __init__(self, poll_seconds: float):
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def wake(self):
+        """Checks for due searches now instead of at the next poll."""
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="saved-search-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            for sid in _claim_due(time.time()):
+                try:
+                    run_saved_search(sid)
+                except Exception:
+                    pass  # keep the scheduler alive; the next interval retries
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+scheduler = SavedSearchScheduler(settings.watch_poll_seconds)
@@ -1,5 +1,22 @@
 import requests
+
+UA = "Mozilla/5.0 (compatible; ai-job-agent/1.0)"
+_session = requests.Session()
+
 def get(url: str, **kw):
     r = requests.get(url, timeout=kw.pop("timeout",20))
     r.raise_for_status()
     return r.text
+
+def get_conditional(url: str, etag: str | None = None, last_modified: str | None = None,
+                    timeout: float = 20) -> requests.Response:
+    """GET with If-None-Match / If-Modified-Since. A 304 is returned, not raised."""
+    headers = {"User-Agent": UA}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    r = _session.get(url, headers=headers, timeout=timeout)
+    if r.status_code != 304:
+        r.raise_for_status()
+    return r
@@ -1,6 +1,8 @@
+import json
 import os
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin
 
 # ---------- Config ----------
@@ -12,6 +14,43 @@ def api(base: str, path: str) -> str:
     """Safe join that avoids double slashes."""
     return urljoin(base if base.endswith("/") else base + "/", path.lstrip("/"))
 
+@st.cache_resource
+def http() -> requests.Session:
+    """One pooled session per server process, reused across reruns and users."""
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+# Cached calls: identical parameters on a rerun reuse the previous response instead of
+# hitting the backend again. Errors raise, so failures are never cached.
+@st.cache_data(ttl=600, show_spinner=False)
+def search_jobs(base: str, profile_id: str, max_results: int) -> list:
+    r = http().post(
+        api(base, "/search_jobs"),
+        params={"profile_id": profile_id},
+        json={"max_results": max_results},
+        timeout=60,
+    )
+    if not r.ok:
+        raise RuntimeError(r.text)
+    return r.json().get("hits", [])
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def compose(base: str, profile_id: str, job: dict, contact: dict | None) -> dict:
+    payload = {"job": job, "contact": contact, "profile_id": profile_id}
+    r = http().post(api(base, "/compose"), json=payload, timeout=45)
+    if not r.ok:
+        raise RuntimeError(r.text)
+    return r.json()
+
+def show_email(data: dict):
+    st.subheader("Subject")
+    st.write(data.get("subject", ""))
+    st.subheader("Body")
+    st.code(data.get("body", ""), language="markdown")
+
 with st.sidebar:
     st.subheader("Settings")
     API_URL = st.text_input("API URL", value=DEFAULT_API)
@@ -22,7 +61,7 @@ col1, col2 = st.columns(2)
 with col1:
     if st.button("Ping /health"):
         try:
-            r = requests.get(api(API_URL, "/health"), timeout=10)
+            r = http().get(api(API_URL, "/health"), timeout=10)
             st.json(r.json())
         except Exception as e:
             st.error(str(e))
@@ -55,7 +94,7 @@ with st.expander("Set profile"):
             "portals": portals,
         }
         try:
-            r = requests.post(api(API_URL, "/profile/set"), json=payload, timeout=20)
+            r = http().post(api(API_URL, "/profile/set"), json=payload, timeout=20)
             if r.ok:
                 st.session_state["profile"] = r.json()
                 st.success("Profile saved")
@@ -72,7 +111,7 @@ if st.button("Upload Resume") and file:
     try:
         with st.spinner("Uploading & parsing resume..."):
             files = {"file": (file.name, file.getvalue(), "application/pdf")}
-            r = requests.post(api(API_URL, "/upload_resume"), files=files, timeout=60)
+            r = http().post(api(API_URL, "/upload_resume"), files=files, timeout=60)
         if r.ok:
             st.session_state["resume"] = r.json()
             st.success("Resume uploaded")
@@ -93,30 +132,35 @@ if st.button("Search"):
         try:
             with st.spinner("Searching portals..."):
                 pid = prof.get("id") or prof.get("profile_id")
-                r = requests.post(
-                    api(API_URL, "/search_jobs"),
-                    params={"profile_id": pid},
-                    json={"max_results": max_results},
-                    timeout=60,
-                )
-            if r.ok:
-                st.session_state["hits"] = r.json().get("hits", [])
-                st.session_state.pop("contact", None)  # clear previous contact
-                for i, h in enumerate(st.session_state["hits"], 1):
-                    st.markdown(
-                        f"**{i}. {h.get('title','(no title)')}** — {h.get('company','')}  "
-                        f"|  `{h.get('portal','')}`  |  score: **{h.get('score','?')}**"
-                    )
-                    if h.get("snippet"):
-                        st.write(h["snippet"])
-                    if h.get("url"):
-                        st.write(h["url"])
-                    st.divider()
-            else:
-                st.error(r.text)
+                st.session_state["hits"] = search_jobs(API_URL, pid, max_results)
+            st.session_state.pop("contact", None)  # clear previous contact
+            st.session_state.pop("email", None)
+            st.session_state.pop("email_contact", None)
         except Exception as e:
             st.error(str(e))
 
+# Rendered from session state so results survive reruns triggered by other widgets.
+# st.dataframe virtualizes rows, so long hit lists stay cheap to redraw.
+if st.session_state.get("hits"):
+    st.dataframe(
+        [
+            {
+                "#": i,
+                "title": h.get("title") or "(no title)",
+                "company": h.get("company", ""),
+                "location": h.get("location") or "",
+                "portal": h.get("portal", ""),
+                "score": h.get("score"),
+                "url": h.get("url") or "",
+                "snippet": h.get("snippet") or "",
+            }
+            for i, h in enumerate(st.session_state["hits"], 1)
+        ],
+        hide_index=True,
+        use_container_width=True,
+        column_config={"url": st.column_config.LinkColumn("url")},
+    )
+
 # ---------- Compose ----------
 st.header("4) Compose Outreach Email")
 sel = None
@@ -134,18 +178,12 @@ if sel and st.button("Compose Mail (no contact)"):
         try:
             with st.spinner("Composing email..."):
                 pid = prof.get("id") or prof.get("profile_id")
-                payload = {"job": sel, "contact": None, "profile_id": pid}
-                r = requests.post(api(API_URL, "/compose"), json=payload, timeout=45)
-            if r.ok:
-                data = r.json()
-                st.subheader("Subject")
-                st.write(data.get("subject", ""))
-                st.subheader("Body")
-                st.code(data.get("body", ""), language="markdown")
-            else:
-                st.error(r.text)
+                st.session_state["email"] = (idx, compose(API_URL, pid, sel, None))
         except Exception as e:
             st.error(str(e))
+# Keep the last draft visible across reruns, but only for the job it was written for
+if sel and st.session_state.get("email") and st.session_state["email"][0] == idx:
+    show_email(st.session_state["email"][1])
 
 # ---------- Recruiter/HR Contact Enrichment ----------
 st.header("5) Find Recruiter / HR Contact")
@@ -182,8 +220,8 @@ if sel:
 
             query = {k: v for k, v in query.items() if v}
 
-            r = requests.post(
-                f"{API_URL}/contact/enrich",
+            r = http().post(
+                api(API_URL, "/contact/enrich"),
                 json={"job": job_payload, "profile_id": pid, "query": query},
                 timeout=45,
             )
@@ -198,13 +236,16 @@ if sel:
     if st.session_state.get("contact") and st.button("Compose Mail (with contact)"):
         prof = st.session_state.get("profile") or st.session_state.get("resume")
         pid = prof.get("id") or prof.get("profile_id") if prof else None
-        payload = {"job": sel, "contact": st.session_state["contact"], "profile_id": pid}
-        r = requests.post(f"{API_URL}/compose", json=payload, timeout=45)
-        if r.ok:
-            data = r.json()
-            st.subheader("Subject"); st.write(data.get("subject",""))
-            st.subheader("Body");    st.code(data.get("body",""), language="markdown")
-        else:
-            st.error(r.text)
+        try:
+            contact = st.session_state["contact"]
+            st.session_state["email_contact"] = ((idx, json.dumps(contact, sort_keys=True)),
+                                                 compose(API_URL, pid, sel, contact))
+        except Exception as e:
+            st.error(str(e))
+    # Same as the no-contact draft: survive reruns, but only for this job + contact
+    drafted = st.session_state.get("email_contact")
+    if drafted and st.session_state.get("contact") and \
+            drafted[0] == (idx, json.dumps(st.session_state["contact"], sort_keys=True)):
+        show_email(drafted[1])
 else:
     st.info("Search jobs and select one to enable contact enrichment.")